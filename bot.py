@@ -5,6 +5,7 @@ from datetime import datetime
 import os
 import re
 import webserver
+from move_executor import move_member, describe_error, format_move_failures
 
 # Bot configuration
 intents = discord.Intents.default()
@@ -17,7 +18,9 @@ intents.members = True
 bot = commands.Bot(command_prefix='!', intents=intents)
 
 # Data storage for active matches
-active_matches = {}  # guild_id: {message_id, participants, start_time, original_channels, paused_at, total_paused_time, match_duration}
+active_matches = {}  # guild_id: {message_id, participants, start_time, original_channels, paused_at, total_paused_time, match_duration, move_failures, failure_notice_sent, ended}
+
+ending_matches = set()  # Running end_match tasks started by match_timer (kept so they aren't garbage collected)
 
 # Match configuration
 DEFAULT_MATCH_DURATION = 400  # 6 minutes and 45 seconds (405 seconds)
@@ -143,7 +146,10 @@ async def start_lane_assignment(message, match_duration=DEFAULT_MATCH_DURATION):
         'guild': message.guild,
         'paused_at': None,  # When the match was paused
         'total_paused_time': 0,  # Total seconds the match has been paused
-        'match_duration': match_duration  # Store the custom duration
+        'match_duration': match_duration,  # Store the custom duration
+        'move_failures': {},  # user_id: (display_name, reason, returning) for the latest failed move, reported when the match ends
+        'failure_notice_sent': False,  # Whether the one-off "moves are failing" notice was posted
+        'ended': False  # Set as soon as end_match starts moving everyone back
     }
     
     await message.reply(f"✅ Lane assignment started! Match will last **{duration_text}**.")
@@ -231,38 +237,71 @@ async def on_reaction_add(reaction, user):
                 except:
                     pass
     
-    try:
-        # Move the user
-        await member.move_to(target_channel)
-        
-        # Update participant data
-        match_data['participants'][user.id] = {
-            'lane': target_lane,
-            'original_channel': original_channel.id,
-            'member': member
-        }
-        
-        # Confirmation message
-        try:
-            confirmation = await reaction.message.channel.send(
-                f"✅ {user.mention} assigned to **{target_lane}**!"
-            )
-            await asyncio.sleep(3)
-            await confirmation.delete()
-        except:
-            pass
-            
-    except discord.HTTPException:
-        try:
-            temp_msg = await reaction.message.channel.send(f"❌ Failed to move {user.mention} - check bot permissions!")
-            await asyncio.sleep(5)
-            await temp_msg.delete()
-        except:
-            pass
+    # The match may be ending already (end_match is moving everyone back)
+    if not is_match_live(guild_id, match_data):
+        return
+    
+    # Move the user (transient errors are retried inside move_member)
+    failure = await move_member(member, target_channel)
+    
+    # The match may have ended while the move was in progress, nothing else will move them back
+    if not is_match_live(guild_id, match_data):
+        if not failure and member.voice:
+            return_failure = await move_member(member, original_channel, wait_for_breaker=True)
+            if return_failure:
+                try:
+                    await reaction.message.channel.send(
+                        f"❌ Couldn't move {user.mention} back to **{original_channel.name}** ({return_failure})"
+                    )
+                except:
+                    pass
+        return
+    
+    if failure:
+        # Failures are reported once in the match summary instead of per user
+        await record_move_failure(match_data, member, failure, reaction.message.channel)
         try:
             await reaction.remove(user)
         except:
             pass
+        return
+    
+    # Update participant data, a successful retry clears any earlier failure
+    match_data['move_failures'].pop(user.id, None)
+    match_data['participants'][user.id] = {
+        'lane': target_lane,
+        'original_channel': original_channel.id,
+        'member': member
+    }
+    
+    # Confirmation message
+    try:
+        confirmation = await reaction.message.channel.send(
+            f"✅ {user.mention} assigned to **{target_lane}**!"
+        )
+        await asyncio.sleep(3)
+        await confirmation.delete()
+    except:
+        pass
+
+def is_match_live(guild_id, match_data):
+    """Check if a match is still running (not ended or replaced)"""
+    return active_matches.get(guild_id) is match_data and not match_data['ended']
+
+async def record_move_failure(match_data, member, reason, channel, returning=False):
+    """Store a failed move for the match summary and post a single notice per match"""
+    match_data['move_failures'][member.id] = (member.display_name, reason, returning)
+    
+    if match_data['failure_notice_sent']:
+        return
+    match_data['failure_notice_sent'] = True
+    
+    try:
+        await channel.send(
+            f"⚠️ Some voice moves are failing ({reason}). Check bot permissions - failed moves will be listed when the match ends."
+        )
+    except:
+        pass
 
 async def handle_pause_reaction(reaction, user, guild_id):
     """Handle pause reaction"""
@@ -330,13 +369,13 @@ async def handle_resume_reaction(reaction, user, guild_id):
 
 async def handle_stop_reaction(reaction, user, guild_id):
     """Handle stop reaction"""
-    # End the match with stop reason
-    await end_match(guild_id, "🛑 Match stopped manually")
-    del active_matches[guild_id]
+    # End the match with stop reason, unless the timer is already ending it
+    if not await end_match(guild_id, "🛑 Match stopped manually"):
+        return
     
     embed = discord.Embed(
         title="🛑 Match Stopped",
-        description="The lane assignment has been stopped and all participants have been moved back to their original channels.",
+        description="The lane assignment has been stopped. See the summary above for who was moved back.",
         color=0xe74c3c
     )
     embed.set_footer(text=f"Stopped by {user.display_name}")
@@ -458,20 +497,26 @@ async def on_reaction_remove(reaction, user):
             original_channel = bot.get_channel(participant_data['original_channel'])
             
             if member.voice and original_channel:
+                failure = await move_member(member, original_channel)
+                
+                # end_match moves everyone back itself and reports the result
+                if not is_match_live(guild_id, match_data):
+                    return
+                
+                if failure:
+                    await record_move_failure(match_data, member, failure, reaction.message.channel, returning=True)
+                    return
+                
+                del match_data['participants'][user.id]
+                match_data['move_failures'].pop(user.id, None)
+                
                 try:
-                    await member.move_to(original_channel)
-                    del match_data['participants'][user.id]
-                    
-                    try:
-                        temp_msg = await reaction.message.channel.send(
-                            f"↩️ {user.mention} moved back to **{original_channel.name}**"
-                        )
-                        await asyncio.sleep(3)
-                        await temp_msg.delete()
-                    except:
-                        pass
-                        
-                except discord.HTTPException:
+                    temp_msg = await reaction.message.channel.send(
+                        f"↩️ {user.mention} moved back to **{original_channel.name}**"
+                    )
+                    await asyncio.sleep(3)
+                    await temp_msg.delete()
+                except:
                     pass
 
 # Keep the old text command handlers for backward compatibility
@@ -561,11 +606,10 @@ async def show_match_status(message):
 async def match_timer():
     """Check if any matches should end"""
     current_time = datetime.now()
-    guilds_to_remove = []
     
     for guild_id, match_data in active_matches.items():
-        # Skip if match is paused
-        if match_data['paused_at'] is not None:
+        # Skip if match is paused or already being ended
+        if match_data['paused_at'] is not None or match_data['ended']:
             continue
             
         start_time = match_data['start_time']
@@ -574,43 +618,87 @@ async def match_timer():
         elapsed = (current_time - start_time).total_seconds() - total_paused_time
         
         # Check if match time is up
+        # Check if match time is up, ending each match in its own task so one
+        # guild's slow moves don't hold up the others
         if elapsed >= match_duration:
-            await end_match(guild_id, "⏰ Time's up!")
-            guilds_to_remove.append(guild_id)
-    
-    # Remove completed matches
-    for guild_id in guilds_to_remove:
-        del active_matches[guild_id]
+            task = asyncio.create_task(end_match(guild_id, "⏰ Time's up!"))
+            ending_matches.add(task)
+            task.add_done_callback(ending_matches.discard)
 
 async def end_match(guild_id, reason="Match ended"):
-    """End an active match and move everyone back"""
+    """End an active match, move everyone back and remove it from active_matches.
+    
+    Returns False if there was no match or another end_match is already handling it.
+    """
     if guild_id not in active_matches:
-        return
+        return False
     
     match_data = active_matches[guild_id]
+    
+    # Another end_match (🛑 vs timer) is already moving everyone back
+    if match_data['ended']:
+        return False
+    match_data['ended'] = True
+    
+    try:
+        await return_participants(match_data, reason)
+    finally:
+        # Only remove our own match, a new one may have been started meanwhile
+        if active_matches.get(guild_id) is match_data:
+            del active_matches[guild_id]
+    
+    return True
+
+async def return_participants(match_data, reason):
+    """Move all participants of an ended match back and post the summary"""
     guild = match_data['guild']
     channel = bot.get_channel(match_data['channel_id'])
     
     moved_users = []
+    move_failures = match_data['move_failures']
     
-    # Move all participants back to their original channels
+    # Move all participants back to their original channels, concurrently so
+    # one member's retries don't hold up everyone else
+    returning = []
     for user_id, participant_data in match_data['participants'].items():
         member = participant_data['member']
         original_channel = bot.get_channel(participant_data['original_channel'])
         
         if member.voice and original_channel:
-            try:
-                await member.move_to(original_channel)
-                moved_users.append(member.display_name)
-            except discord.HTTPException:
-                pass
+            returning.append((member, original_channel))
+        elif not member.voice:
+            # They left voice on their own, so they aren't stuck in a lane anymore
+            move_failures.pop(user_id, None)
+    
+    # This is the last chance to move them, so wait out an open circuit breaker
+    results = await asyncio.gather(
+        *(move_member(member, original_channel, wait_for_breaker=True) for member, original_channel in returning),
+        return_exceptions=True
+    )
+    
+    for (member, original_channel), failure in zip(returning, results):
+        if isinstance(failure, BaseException):
+            failure = describe_error(failure)
+        
+        if failure:
+            move_failures[member.id] = (member.display_name, failure, True)
+        else:
+            move_failures.pop(member.id, None)
+            moved_users.append(member.display_name)
     
     # Send completion message
     if channel:
+        # Failed lane joins left people in their own channel, only failed returns need action
+        stuck = any(was_returning for name, failure, was_returning in move_failures.values())
+        if stuck:
+            description = f"{reason}\n\nSome participants could not be moved back and are still in a lane channel, see below."
+        else:
+            description = f"{reason}\n\nAll participants have been moved back to their original voice channels."
+        
         embed = discord.Embed(
             title="🏁 Lane Assignment Complete!",
-            description=f"{reason}\n\nAll participants have been moved back to their original voice channels.",
-            color=0x2ecc71
+            description=description,
+            color=0xf39c12 if stuck else 0x2ecc71
         )
         
         if moved_users:
@@ -620,6 +708,14 @@ async def end_match(guild_id, reason="Match ended"):
                 inline=False
             )
         
+        # One aggregated report for every failed move during the match
+        if move_failures:
+            embed.add_field(
+                name=f"⚠️ Failed Moves ({len(move_failures)})",
+                value=format_move_failures(move_failures)[:1024],  # Embed field value limit
+                inline=False
+            )
+        
         embed.timestamp = datetime.now()
         await channel.send(embed=embed)
 
@@ -0,0 +1,157 @@
+import discord
+import aiohttp
+import asyncio
+import random
+import time
+
+# discord.py already retries every request internally: it sleeps through 429s
+# using retry_after and retries 500/502/504/524 and connection resets several
+# times with backoff. Anything that reaches us has survived all of that, so we
+# only allow one extra attempt for server/connection errors and never retry 429.
+MAX_MOVE_ATTEMPTS = 2
+RETRY_BASE_DELAY = 2  # Upper bound in seconds for the jittered retry sleep
+
+# Circuit breaker configuration
+BREAKER_FAILURE_THRESHOLD = 3  # Consecutive guild-level failures before opening
+BREAKER_COOLDOWN = 60  # Seconds to wait before trying the guild again
+
+# Circuit breaker state per guild
+guild_breakers = {}  # guild_id: {failures, opened_at, probe}
+
+# Errors move_member turns into a failure reason instead of raising
+MOVE_ERRORS = (discord.DiscordException, aiohttp.ClientError, asyncio.TimeoutError, OSError)
+
+def is_transient_error(error):
+    """Check if a move error is worth one more attempt"""
+    if isinstance(error, (asyncio.TimeoutError, OSError, aiohttp.ClientError)):
+        return True
+    if isinstance(error, discord.HTTPException):
+        # A 429 only escapes discord.py on a Cloudflare ban, retrying makes it worse
+        return error.status >= 500
+    return False
+
+def is_rate_limited(error):
+    """Check if a move error is a rate limit discord.py gave up on"""
+    if isinstance(error, discord.RateLimited):
+        return True
+    return isinstance(error, discord.HTTPException) and error.status == 429
+
+def is_guild_error(error):
+    """Check if a move error points at the guild rather than a single member"""
+    return isinstance(error, discord.Forbidden) or is_rate_limited(error) or is_transient_error(error)
+
+def backoff_delay(attempt):
+    """Jittered exponential backoff delay for the given retry attempt"""
+    return random.uniform(0, RETRY_BASE_DELAY * 2 ** attempt)
+
+def describe_error(error):
+    """Short human readable reason for a failed move"""
+    if isinstance(error, discord.Forbidden):
+        return "missing permissions"
+    if isinstance(error, discord.NotFound):
+        return "channel or member not found"
+    if is_rate_limited(error):
+        return "rate limited by Discord"
+    if isinstance(error, discord.HTTPException):
+        return f"Discord error ({error.status})"
+    if isinstance(error, (asyncio.TimeoutError, OSError, aiohttp.ClientError)):
+        return "connection problem"
+    return "unexpected error"
+
+def remaining_cooldown(guild_id):
+    """Seconds until the guild's circuit allows a probe, 0 if it isn't open"""
+    breaker = guild_breakers.get(guild_id)
+    if not breaker or breaker['opened_at'] is None:
+        return 0
+    return max(0, BREAKER_COOLDOWN - (time.monotonic() - breaker['opened_at']))
+
+def is_circuit_open(guild_id):
+    """Check if moves for this guild are currently suspended"""
+    return remaining_cooldown(guild_id) > 0
+
+def record_success(guild_id):
+    """Close the circuit for a guild after a successful move"""
+    guild_breakers.pop(guild_id, None)
+
+def record_failure(guild_id):
+    """Count a guild-level failure and open the circuit if the threshold is hit"""
+    breaker = guild_breakers.setdefault(guild_id, {'failures': 0, 'opened_at': None, 'probe': None})
+    breaker['failures'] += 1
+
+    if breaker['failures'] >= BREAKER_FAILURE_THRESHOLD:
+        breaker['opened_at'] = time.monotonic()
+
+async def attempt_move(member, channel):
+    """Try the move, with one retry for server/connection errors"""
+    guild_id = member.guild.id
+
+    for attempt in range(MAX_MOVE_ATTEMPTS):
+        try:
+            await member.move_to(channel)
+            record_success(guild_id)
+            return None
+        except MOVE_ERRORS as error:
+            if is_transient_error(error) and attempt < MAX_MOVE_ATTEMPTS - 1:
+                await asyncio.sleep(backoff_delay(attempt))
+                continue
+
+            # Member-level errors (e.g. member left voice) don't count against the guild
+            if is_guild_error(error):
+                record_failure(guild_id)
+            return describe_error(error)
+
+async def move_member(member, channel, wait_for_breaker=False):
+    """Move a member to a voice channel, respecting the guild's circuit breaker.
+
+    With wait_for_breaker an open circuit is waited out once (at most
+    BREAKER_COOLDOWN seconds) instead of failing fast, for moves that
+    won't get another chance.
+
+    Returns None on success, otherwise a short reason for the failure.
+    """
+    guild_id = member.guild.id
+
+    while True:
+        # While a probe is in flight, wait for its result instead of failing fast
+        breaker = guild_breakers.get(guild_id)
+        if breaker and breaker['probe'] is not None:
+            await breaker['probe'].wait()
+            continue
+
+        if not is_circuit_open(guild_id):
+            break
+        if not wait_for_breaker:
+            return "moves paused after repeated failures"
+
+        wait_for_breaker = False
+        await asyncio.sleep(remaining_cooldown(guild_id))
+
+    if not breaker or breaker['opened_at'] is None:
+        return await attempt_move(member, channel)
+
+    # Cooldown is over (half-open): this move probes the guild, everyone else waits
+    probe = asyncio.Event()
+    breaker['probe'] = probe
+    try:
+        return await attempt_move(member, channel)
+    finally:
+        # A member-level failure leaves the breaker half-open for the next probe
+        breaker['probe'] = None
+        probe.set()
+
+def format_move_failures(failures):
+    """Build a summary of failed moves, grouped by direction and reason"""
+    by_reason = {}
+    for name, reason, returning in failures.values():
+        label = f"couldn't return: {reason}" if returning else f"couldn't join lane: {reason}"
+        by_reason.setdefault(label, []).append(name)
+
+    lines = []
+    for reason, names in by_reason.items():
+        # Limit to 10 names per reason to avoid embed limits
+        shown = ", ".join(names[:10])
+        if len(names) > 10:
+            shown += f" ... and {len(names) - 10} more"
+        lines.append(f"**{reason}** ({len(names)}): {shown}")
+
+    return "\n".join(lines)